@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
-from pydantic import field_validator
+from pydantic import Field, computed_field
+from functools import cached_property, lru_cache
 import os
 
 class Settings(BaseSettings):
@@ -9,9 +10,6 @@ class Settings(BaseSettings):
     # Base URLs
     NEWS_API_BASE_URL: str = "https://newsdata.io/api/1/latest?apikey={}&country=in"
 
-    # Formatted URLs (will be created using validators)
-    NEWS_API_URL: str = ""
-
     # Elasticsearch Configuration
     ELASTICSEARCH_URL: str = "http://localhost:9200"
 
@@ -21,16 +19,43 @@ class Settings(BaseSettings):
     # Article Retention (days)
     ARTICLE_RETENTION_DAYS: int = 7
 
+    # Number of articles to accumulate before a bulk index request
+    INDEX_BATCH_SIZE: int = 100
+
+    # Documents per bulk request chunk
+    BULK_CHUNK_SIZE: int = 200
+
+    # Minimum extracted text length for a static fetch to count as a hit
+    STATIC_MIN_CONTENT_LENGTH: int = 200
+
+    # Where the bloom filter of already-indexed articles is persisted
+    BLOOM_FILTER_PATH: str = "seen_articles.bloom"
+
+    # Where the simhash entries for near-duplicate detection are persisted
+    SIMHASH_INDEX_PATH: str = "simhash_index.pkl"
+
+    # Elasticsearch index tuning for sustained bulk indexing
+    INDEX_REFRESH_INTERVAL: str = "5s"
+    TRANSLOG_FLUSH_THRESHOLD: str = "1gb"
+
     # API Headers
-    NEWS_API_HEADERS: dict = {}
+    NEWS_API_HEADERS: dict = Field(default_factory=dict)
 
-    @field_validator('NEWS_API_URL')
-    def format_news_api_url(cls, v, info):
-        """Format the NEWS_API_URL with the API key"""
-        return info.data['NEWS_API_BASE_URL'].format(info.data['NEWS_API_KEY'])
+    @computed_field
+    @cached_property
+    def NEWS_API_URL(self) -> str:
+        """Format the API URL with the key once; cached for the process lifetime"""
+        return self.NEWS_API_BASE_URL.format(self.NEWS_API_KEY)
 
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
 
-settings = Settings()
\ No newline at end of file
+
+@lru_cache
+def get_settings():
+    """Build Settings once per process; later callers reuse the same instance"""
+    return Settings()
+
+
+settings = get_settings()
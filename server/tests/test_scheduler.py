@@ -0,0 +1,74 @@
+import os
+import sys
+
+os.environ.setdefault("NEWS_API_KEY", "test-key")
+
+# Add project root to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pydantic import HttpUrl, TypeAdapter
+
+from scripts.scheduler import parse_article_content, url_to_doc_id
+
+# A typical CSS-framework page: every wrapper div is classed, and the
+# article tag itself carries a class
+ARTICLE_WITH_CLASS = """
+<html><body>
+<div class="page container">
+  <article class="story">
+    <p>Classed article body text.</p>
+    <aside class="ad">Buy now</aside>
+  </article>
+</div>
+</body></html>
+"""
+
+ARTICLE_CONTENT_DIV = """
+<html><body>
+<div class="article-content">
+  <p>Div body text.</p>
+</div>
+</body></html>
+"""
+
+NO_ARTICLE = "<html><body><div class='nav'>Menu</div></body></html>"
+
+
+def test_extracts_classed_article():
+    content = parse_article_content(
+        ARTICLE_WITH_CLASS, "https://example.com/story"
+    )
+    assert content is not None
+    assert "Classed article body text." in content
+
+
+def test_strips_unwanted_blocks():
+    content = parse_article_content(
+        ARTICLE_WITH_CLASS, "https://example.com/story"
+    )
+    assert "Buy now" not in content
+
+
+def test_extracts_article_content_div():
+    content = parse_article_content(
+        ARTICLE_CONTENT_DIV, "https://example.com/div"
+    )
+    assert "Div body text." in content
+
+
+def test_returns_none_without_article():
+    assert parse_article_content(NO_ARTICLE, "https://example.com/none") is None
+
+
+def test_doc_id_same_for_raw_and_validated_link():
+    # The bloom pre-check sees the raw API string; the post-index add sees
+    # the pydantic-normalized HttpUrl - both must derive the same id
+    raw = "https://Example.com/news/story-1"
+    validated = TypeAdapter(HttpUrl).validate_python(raw)
+    assert url_to_doc_id(raw) == url_to_doc_id(validated)
+
+
+def test_doc_id_same_for_bare_domain():
+    raw = "https://example.com"
+    validated = TypeAdapter(HttpUrl).validate_python(raw)
+    assert url_to_doc_id(raw) == url_to_doc_id(validated)